@@ -26,6 +26,7 @@ test_requirements = [
     'epab',
     'httmock',
     'mimesis',
+    'pytest-xdist',
 ]
 
 CLASSIFIERS = filter(None, map(str.strip,
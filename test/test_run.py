@@ -1,70 +1,109 @@
 # coding=utf-8
 
 import string
+from unittest.mock import DEFAULT, MagicMock, call, patch
 
 import delegator
-import pexpect
 import pytest
-from hypothesis import given, strategies as st
-from mockito import mock, unstub, verify, when
+from hypothesis import Phase, given, settings, strategies as st
 
 import elib.run
 from elib.run import filter_line
 
 
-@pytest.fixture(name='process', autouse=True)
+@pytest.fixture(name='process')
 def _process():
-    process = mock()
-    subprocess = mock()
+    process = MagicMock()
     process.out = 'output'
     process.err = ''
     process.name = 'test.exe'
     process.return_code = 0
-    process.subprocess = subprocess
-    when(delegator).run(...).thenReturn(process)
-    when(elib.run).find_executable('test').thenReturn(process)
-    when(elib.run).cmd_start(...)
-    when(elib.run).cmd_end(...)
-    when(elib.run).info(...)
-    when(elib.run).error(...)
-    when(elib.run).std_out(...)
-    when(elib.run).std_err(...)
-    yield process
-
-
-@given(text=st.text(alphabet=string.printable))
+    with patch.object(delegator, 'run', return_value=process):
+        yield process
+
+
+@pytest.fixture(name='mocks', autouse=True)
+def _mocks(process):
+    with patch.multiple(
+        elib.run,
+        find_executable=DEFAULT,
+        cmd_start=DEFAULT,
+        cmd_end=DEFAULT,
+        info=DEFAULT,
+        error=DEFAULT,
+        std_out=DEFAULT,
+        std_err=DEFAULT,
+    ) as mocks:
+        mocks['find_executable'].return_value = process
+        yield mocks
+
+
+TEXT = 'some random text'
+PRINTABLE = st.text(alphabet=string.printable, max_size=64)
+
+
+@settings(max_examples=20, deadline=None, database=None, phases=[Phase.generate])
+@given(text=PRINTABLE)
 def test_filter_line_raw(text):
     assert filter_line(text, None) == text
 
 
-def test_filter_line():
-    text = 'some random text'
-    assert filter_line(text, None) == text
-    assert filter_line(text, ['some']) is None
-    assert filter_line(text, [' some']) == text
-    assert filter_line(text, ['some ']) is None
-    assert filter_line(text, ['random']) is None
-    assert filter_line(text, [' random']) is None
-    assert filter_line(text, ['random ']) is None
-    assert filter_line(text, [' random ']) is None
-    assert filter_line(text, ['text']) is None
-    assert filter_line(text, [' text']) is None
-    assert filter_line(text, [' text ']) == text
-
-
-def test_exe_not_found():
-    when(elib.run).find_executable(...).thenReturn(None)
+@pytest.mark.parametrize(
+    'filters,expected',
+    [
+        (None, TEXT),
+        (['some'], None),
+        ([' some'], TEXT),
+        (['some '], None),
+        (['random'], None),
+        ([' random'], None),
+        (['random '], None),
+        ([' random '], None),
+        (['text'], None),
+        ([' text'], None),
+        ([' text '], TEXT),
+    ]
+)
+def test_filter_line(filters, expected):
+    assert filter_line(TEXT, filters) == expected
+
+
+def test_exe_not_found(mocks):
+    mocks['find_executable'].return_value = None
     with pytest.raises(SystemExit):
         elib.run.run('test')
 
 
-def _basic_check(output, code):
-    verify(elib.run).info('test.exe -> 0')
-    verify(elib.run, times=0).cmd_start(...)
-    verify(elib.run, times=0).cmd_end(...)
-    verify(elib.run, times=0).std_err(...)
-    verify(elib.run).std_out(output)
-    verify(elib.run, times=0).error(...)
+_CONSOLE = ('cmd_start', 'cmd_end', 'info', 'error', 'std_out', 'std_err')
+
+
+class _StartsWith:
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __eq__(self, other):
+        return isinstance(other, str) and other.startswith(self.prefix)
+
+    def __repr__(self):
+        return f'<str starting with {self.prefix!r}>'
+
+
+_RUNNING = call(_StartsWith('RUNNING: '))
+
+
+def _assert_only_called(mocks, **expected):
+    mocks['find_executable'].assert_called_once_with('test')
+    for name in _CONSOLE:
+        assert mocks[name].call_args_list == expected.get(name, []), name
+
+
+def _basic_check(mocks, output, code):
+    _assert_only_called(
+        mocks,
+        info=[_RUNNING, call('test.exe -> 0')],
+        std_out=[call(output)],
+    )
     assert code == 0
 
 
@@ -79,96 +118,97 @@ def _basic_check(output, code):
         ('test\n\ntest\n\n', 'test\ntest'),
     ]
 )
-def test_output(process, input_, output):
+def test_output(process, mocks, input_, output):
     process.out = input_
     out, code = elib.run.run('test')
-    _basic_check(out, code)
+    _basic_check(mocks, out, code)
     assert out == output
 
 
-def test_no_output(process):
+def test_no_output(process, mocks):
     process.out = ''
     out, code = elib.run.run('test')
-    _basic_check(out, code)
+    _basic_check(mocks, out, code)
     assert out == ''
 
 
-def test_filtered_output():
+def test_filtered_output(mocks):
     out, code = elib.run.run('test', filters=['output'])
-    _basic_check(out, code)
+    _basic_check(mocks, out, code)
     assert out == ''
 
 
-def test_mute_output():
+def test_mute_output(mocks):
     out, code = elib.run.run('test', mute=True)
-    verify(elib.run, times=0).info(...)
-    verify(elib.run, times=0).error(...)
-    verify(elib.run).cmd_end(' -> 0')
-    verify(elib.run, times=0).std_err(...)
-    verify(elib.run, times=0).std_out(...)
+    _assert_only_called(
+        mocks,
+        cmd_start=[_RUNNING],
+        cmd_end=[call(' -> 0')],
+    )
     assert code == 0
     assert out == 'output'
 
 
-def test_filter_as_str(process):
+def test_filter_as_str(process, mocks):
     process.out = 'output\ntest'
     out, code = elib.run.run('test', mute=True, filters='test')
-    verify(elib.run, times=0).info(...)
-    verify(elib.run, times=0).error(...)
-    verify(elib.run).cmd_end(' -> 0')
-    verify(elib.run, times=0).std_err(...)
-    verify(elib.run, times=0).std_out(...)
+    _assert_only_called(
+        mocks,
+        cmd_start=[_RUNNING],
+        cmd_end=[call(' -> 0')],
+    )
     assert code == 0
     assert out == 'output'
 
 
-def test_error(process):
+def test_error(process, mocks):
     process.return_code = 1
     process.out = 'some error'
     out, code = elib.run.run('test', filters=['output'], failure_ok=True)
-    verify(elib.run, times=0).cmd_start(...)
-    verify(elib.run, times=0).cmd_end(...)
-    verify(elib.run).std_err('test.exe error:\nsome error')
-    verify(elib.run, times=0).std_out(...)
-    verify(elib.run, times=1).error('command failed: test.exe -> 1')
+    _assert_only_called(
+        mocks,
+        info=[_RUNNING],
+        std_err=[call('test.exe error:\nsome error')],
+        error=[call('command failed: test.exe -> 1')],
+    )
     assert code == 1
     assert out == 'some error'
 
 
-def test_error_no_result(process):
+def test_error_no_result(process, mocks):
     process.return_code = 1
     process.out = ''
     out, code = elib.run.run('test', filters=['output'], failure_ok=True)
-    verify(elib.run, times=0).cmd_start(...)
-    verify(elib.run, times=0).cmd_end(...)
-    verify(elib.run, times=0).std_err(...)
-    verify(elib.run, times=0).std_out(...)
-    verify(elib.run).error('command failed: test.exe -> 1')
+    _assert_only_called(
+        mocks,
+        info=[_RUNNING],
+        error=[call('command failed: test.exe -> 1')],
+    )
     assert code == 1
     assert out == ''
 
 
-def test_error_muted(process):
+def test_error_muted(process, mocks):
     process.return_code = 1
-    unstub(process.subprocess)
-    when(process.subprocess).read_nonblocking(1, None).thenReturn('some output').thenRaise(pexpect.exceptions.EOF(None))
     out, code = elib.run.run('test', filters=['output'], failure_ok=True, mute=True)
-    verify(elib.run, times=0).info(...)
-    verify(elib.run).cmd_end('')
-    verify(elib.run, times=0).std_err(...)
-    verify(elib.run, times=0).std_out(...)
-    verify(elib.run).error('command failed: test.exe -> 1')
+    _assert_only_called(
+        mocks,
+        cmd_start=[_RUNNING],
+        cmd_end=[call('')],
+        error=[call('command failed: test.exe -> 1')],
+    )
     assert code == 1
     assert out == ''
 
 
-def test_failure(process):
+def test_failure(process, mocks):
     process.return_code = 1
     process.out = 'error'
     with pytest.raises(SystemExit):
         elib.run.run('test', filters=['output'])
-    verify(elib.run, times=0).cmd_start(...)
-    verify(elib.run, times=0).cmd_end(...)
-    verify(elib.run).std_err('test.exe error:\nerror')
-    verify(elib.run, times=0).std_out(...)
-    verify(elib.run).error('command failed: test.exe -> 1')
+    _assert_only_called(
+        mocks,
+        info=[_RUNNING],
+        std_err=[call('test.exe error:\nerror')],
+        error=[call('command failed: test.exe -> 1')],
+    )